@@ -1,11 +1,16 @@
 """Support for the GCE IPX800 V3."""
-from base64 import b64decode
+from __future__ import annotations
+
+import asyncio
+from base64 import b64encode
 from datetime import timedelta
+from functools import lru_cache
+from hmac import compare_digest
 from http import HTTPStatus
 import logging
 
 from aiohttp import web
-from pyipx800v3_async import IPX800V3, Ipx800v3CannotConnectError, Ipx800v3InvalidAuthError, Ipx800v3RequestError
+from pyipx800v3_async import IPX800V3, Ipx800v3CannotConnectError, Ipx800v3InvalidAuthError, Ipx800v3RequestError, Output
 import voluptuous as vol
 
 from homeassistant.components.http import HomeAssistantView
@@ -47,10 +52,15 @@ from .const import (
     CONF_TYPE_ALLOWED,
     CONTROLLER,
     COORDINATOR,
+    DATA_PREFIXES,
     DEFAULT_SCAN_INTERVAL,
     DEFAULT_TRANSITION,
     DOMAIN,
+    ENTRY_DATA,
+    MIN_SCAN_INTERVAL,
+    OUTPUTS,
     PLATFORMS,
+    PUSH_ENTITIES,
     PUSH_USERNAME,
     REQUEST_REFRESH_DELAY,
     TYPE_DIGITALIN,
@@ -58,17 +68,15 @@ from .const import (
     UNDO_UPDATE_LISTENER,
 )
 
-from .tools_entities import (
-    filter_entities_by_platform,
-)
-
 _LOGGER = logging.getLogger(__name__)
 
+_TRUTHY = frozenset({"1", "on", "true"})
+
 DEVICE_CONFIG_SCHEMA_ENTRY = vol.Schema(
     {
         vol.Required(CONF_NAME): cv.string,
-        vol.Required(CONF_COMPONENT): cv.string,
-        vol.Required(CONF_TYPE): cv.string,
+        vol.Required(CONF_COMPONENT): vol.In(CONF_COMPONENT_ALLOWED),
+        vol.Required(CONF_TYPE): vol.In(CONF_TYPE_ALLOWED),
         vol.Optional(CONF_ID): cv.positive_int,
         vol.Optional(CONF_DEFAULT_BRIGHTNESS): cv.positive_int,
         vol.Optional(CONF_ICON): cv.icon,
@@ -119,7 +127,6 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     hass.data.setdefault(DOMAIN, {})
 
     config = entry.data
-    options = entry.options
 
     ipx = IPX800V3(
         host=config[CONF_HOST],
@@ -150,38 +157,33 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         )
         raise ConfigEntryNotReady from exception
 
+    pending_get: asyncio.Future | None = None
+
+    async def async_global_get() -> dict:
+        """Share a single in-flight global_get between concurrent callers."""
+        nonlocal pending_get
+        if pending_get is not None:
+            return await pending_get
+        pending_get = asyncio.ensure_future(ipx.global_get())
+        try:
+            return await pending_get
+        finally:
+            pending_get = None
+
     async def async_update_data():
         """Fetch data from API."""
         try:
-            return await ipx.global_get()
-        except Ipx800v3CannotConnectError as exception:
-            _LOGGER.error(
-                "Cannot connect to the IPX800 named %s, check host, port",
-                config[CONF_NAME],
-            )
-            raise ConfigEntryNotReady from exception
-        except Ipx800v3InvalidAuthError as exception:
-            _LOGGER.error(
-                "Cannot connect to the IPX800 named %s, check username or password",
-                config[CONF_NAME],
-            )
-            raise ConfigEntryNotReady from exception
-        except Ipx800v3RequestError as exception:
-            _LOGGER.error(
-                "Request to IPX800 named %s name failed",
-                config[CONF_NAME],
-            )
-            raise ConfigEntryNotReady from exception
-        
-
-    scan_interval = options.get(
-        CONF_SCAN_INTERVAL, config.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL)
-    )
-
-    if scan_interval < 10:
-        _LOGGER.warning(
-            "A scan interval too low has been set, you probably will get errors since the IPX800 can't handle too much request at the same time"
-        )
+            return build_data_tables(await async_global_get())
+        except (
+            Ipx800v3CannotConnectError,
+            Ipx800v3InvalidAuthError,
+            Ipx800v3RequestError,
+        ) as exception:
+            raise UpdateFailed(
+                f"Error fetching data from the IPX800 named {config[CONF_NAME]}: {exception}"
+            ) from exception
+
+    scan_interval = get_scan_interval(entry)
 
     coordinator = DataUpdateCoordinator(
         hass,
@@ -189,6 +191,7 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         name=DOMAIN,
         update_method=async_update_data,
         update_interval=timedelta(seconds=scan_interval),
+        always_update=False,
         request_refresh_debouncer=Debouncer(
             hass,
             _LOGGER,
@@ -197,15 +200,18 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         ),
     )
 
-    undo_listener = entry.add_update_listener(_async_update_listener)
+    await coordinator.async_config_entry_first_refresh()
 
-    await coordinator.async_refresh()
+    undo_listener = entry.add_update_listener(_async_update_listener)
 
     hass.data[DOMAIN][entry.entry_id] = {
         CONF_NAME: config[CONF_NAME],
         CONTROLLER: ipx,
         COORDINATOR: coordinator,
         CONF_DEVICES: {},
+        ENTRY_DATA: dict(config),
+        OUTPUTS: {},
+        PUSH_ENTITIES: {},
         UNDO_UPDATE_LISTENER: undo_listener,
     }
 
@@ -226,26 +232,35 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         )
         return True
 
-    entities = list(config[CONF_DEVICES])
-
-    for platform in PLATFORMS:
-        _LOGGER.debug("Load platform %s", platform)
-        hass.data[DOMAIN][entry.entry_id][CONF_DEVICES][platform] = (
-            filter_entities_by_platform(entities, platform)
-        )
+    devices_by_platform: dict[str, dict[str, list]] = {
+        platform: {ipx_type: [] for ipx_type in CONF_TYPE_ALLOWED}
+        for platform in PLATFORMS
+    }
+    for device in config[CONF_DEVICES]:
+        platform_devices = devices_by_platform.get(device.get(CONF_COMPONENT), {})
+        type_devices = platform_devices.get(device.get(CONF_TYPE))
+        if type_devices is None:
+            _LOGGER.error(
+                "Device %s skipped: %s %s or %s %s not correct or supported",
+                device.get(CONF_NAME),
+                CONF_COMPONENT,
+                device.get(CONF_COMPONENT),
+                CONF_TYPE,
+                device.get(CONF_TYPE),
+            )
+            continue
+        type_devices.append(device)
+    hass.data[DOMAIN][entry.entry_id][CONF_DEVICES] = devices_by_platform
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
     # Provide endpoints for the IPX to call to push states
     if CONF_PUSH_PASSWORD in config:
         hass.http.register_view(
-            IpxRequestView(config[CONF_HOST], config[CONF_PUSH_PASSWORD])
-        )
-        hass.http.register_view(
-            IpxRequestDataView(config[CONF_HOST], config[CONF_PUSH_PASSWORD])
-        )
-        hass.http.register_view(
-            IpxRequestRefreshView(
-                config[CONF_HOST], config[CONF_PUSH_PASSWORD], coordinator
+            IpxRequestRouter(
+                config[CONF_HOST],
+                config[CONF_PUSH_PASSWORD],
+                coordinator,
+                hass.data[DOMAIN][entry.entry_id][PUSH_ENTITIES],
             )
         )
     else:
@@ -259,62 +274,72 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
-    for component in CONF_COMPONENT_ALLOWED:
-        await hass.config_entries.async_forward_entry_unload(entry, component)
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
 
-    del hass.data[DOMAIN]
+    if unload_ok:
+        hass.data[DOMAIN][entry.entry_id][UNDO_UPDATE_LISTENER]()
+        hass.data[DOMAIN].pop(entry.entry_id)
 
-    return True
+    return unload_ok
 
 
 async def _async_update_listener(hass: HomeAssistant, config_entry: ConfigEntry):
     """Handle options update."""
-    await hass.config_entries.async_reload(config_entry.entry_id)
-
-
-def build_device_list(devices_config: list) -> list:
-    """Check and build device list from config."""
-    _LOGGER.debug("Check and build devices configuration")
-
-    devices = []
-    for device_config in devices_config:
-        _LOGGER.debug("Read device name: %s", device_config.get(CONF_NAME))
-
-        # Check if component is supported
-        if device_config[CONF_COMPONENT] not in CONF_COMPONENT_ALLOWED:
-            _LOGGER.error(
-                "Device %s skipped: %s %s not correct or supported",
-                device_config[CONF_NAME],
-                CONF_COMPONENT,
-                device_config[CONF_COMPONENT],
-            )
-            continue
+    entry_data = hass.data[DOMAIN][config_entry.entry_id]
+    if entry_data[ENTRY_DATA] != config_entry.data:
+        await hass.config_entries.async_reload(config_entry.entry_id)
+        return
+
+    # Only the options changed, adjust the polling without reloading entities
+    entry_data[COORDINATOR].update_interval = timedelta(
+        seconds=get_scan_interval(config_entry)
+    )
 
-        # Check if type is supported
-        if device_config[CONF_TYPE] not in CONF_TYPE_ALLOWED:
-            _LOGGER.error(
-                "Device %s skipped: %s %s not correct or supported",
-                device_config[CONF_NAME],
-                CONF_TYPE,
-                device_config[CONF_TYPE],
-            )
-            continue
 
-        devices.append(device_config)
-        _LOGGER.info(
-            "Device %s added (component: %s)",
-            device_config[CONF_NAME],
-            device_config[CONF_COMPONENT],
+def get_scan_interval(entry: ConfigEntry) -> int:
+    """Return the scan interval of an entry, clamped to what the IPX800 supports."""
+    scan_interval = entry.options.get(
+        CONF_SCAN_INTERVAL,
+        entry.data.get(CONF_SCAN_INTERVAL, DEFAULT_SCAN_INTERVAL),
+    )
+    if scan_interval < MIN_SCAN_INTERVAL:
+        _LOGGER.warning(
+            "Scan interval of %s seconds is too low for the IPX800, %s seconds is used instead",
+            scan_interval,
+            MIN_SCAN_INTERVAL,
         )
-    return devices
-
-
-def filter_device_list(devices: list, component: str) -> list:
-    """Filter device list by component."""
-    return list(filter(lambda d: d[CONF_COMPONENT] == component, devices))
-
-
-def check_api_auth(request, host, password) -> bool:
+        return MIN_SCAN_INTERVAL
+    return scan_interval
+
+
+def build_data_tables(data: dict) -> dict[str, list]:
+    """Build lists indexed by id for each prefix of the global_get data."""
+    values: dict[str, dict[int, object]] = {prefix: {} for prefix in DATA_PREFIXES}
+    for key, value in data.items():
+        for prefix, prefix_values in values.items():
+            if not key.startswith(prefix):
+                continue
+            index = key[len(prefix):]
+            if index.isdigit():
+                prefix_values[int(index)] = value
+                break
+
+    tables = {}
+    for prefix, prefix_values in values.items():
+        table = [None] * (max(prefix_values, default=-1) + 1)
+        for index, value in prefix_values.items():
+            table[index] = value
+        tables[prefix] = table
+    return tables
+
+
+def build_expected_auth(password: str) -> str:
+    """Build the Authorization header expected from the IPX800 on API call."""
+    credentials = b64encode(f"{PUSH_USERNAME}:{password}".encode()).decode()
+    return f"Basic {credentials}"
+
+
+def check_api_auth(request, host, expected_auth) -> bool:
     """Check authentication on API call."""
     if request.remote != host:
         _LOGGER.warning("API call not coming from IPX800 IP")
@@ -322,104 +347,157 @@ def check_api_auth(request, host, password) -> bool:
     if "Authorization" not in request.headers:
         _LOGGER.warning("API call no authentication provided")
         return False
-    header_auth = request.headers["Authorization"]
-    split = header_auth.strip().split(" ")
-    if len(split) != 2 or split[0].strip().lower() != "basic":
-        _LOGGER.warning("Malformed Authorization header")
-        return False
-    header_username, header_password = b64decode(split[1]).decode().split(":", 1)
-    if header_username != PUSH_USERNAME or header_password != password:
+    if not compare_digest(
+        request.headers["Authorization"].strip().encode(), expected_auth.encode()
+    ):
         _LOGGER.warning("API call authentication invalid")
         return False
     return True
 
 
-class IpxRequestView(HomeAssistantView):
-    """Provide a page for the device to call."""
+class IpxRequestRouter(HomeAssistantView):
+    """Provide the pages for the device to push states or force a refresh."""
 
     requires_auth = False
-    url = "/api/ipx800v3/{entity_id}/{state}"
+    url = "/api/{kind:ipx800v3(?:_data|_refresh)?}/{rest:.+}"
     name = "api:ipx800v3"
 
-    def __init__(self, host: str, password: str) -> None:
-        """Init the IPX view."""
+    def __init__(
+        self,
+        host: str,
+        password: str,
+        coordinator: DataUpdateCoordinator,
+        push_entities: dict[str, IpxEntity],
+    ) -> None:
+        """Init the IPX router."""
         self.host = host
-        self.password = password
+        self._expected_auth = build_expected_auth(password)
+        self.coordinator = coordinator
+        self.push_entities = push_entities
         super().__init__()
 
-    async def get(self, request, entity_id, state):
+    async def get(self, request, kind, rest):
         """Respond to requests from the device."""
-        if not check_api_auth(request, self.host, self.password):
+        if not check_api_auth(request, self.host, self._expected_auth):
             return web.Response(status=HTTPStatus.UNAUTHORIZED, text="Unauthorized")
-        hass = request.app["hass"]
-        old_state = hass.states.get(entity_id)
-        _LOGGER.debug("Update %s to state %s", entity_id, state)
-        if old_state:
-            hass.states.async_set(entity_id, state, old_state.attributes)
+        if kind == "ipx800v3_data":
+            hass = request.app["hass"]
+            response = self._handle_data(hass, rest)
+            # A single refresh is enough for the whole batch, the debouncer
+            # also merges it with any refresh the device requests afterwards
+            hass.async_create_task(self.coordinator.async_request_refresh())
+            return response
+        if kind == "ipx800v3_refresh":
+            await self.coordinator.async_request_refresh()
             return web.Response(status=HTTPStatus.OK, text="OK")
-        _LOGGER.warning("Entity not found for state updating: %s", entity_id)
-
-
-class IpxRequestDataView(HomeAssistantView):
-    """Provide a page for the device to call for send multiple data at once."""
-
-    requires_auth = False
-    url = "/api/ipx800v3_data/{data}"
-    name = "api:ipx800v3_data"
+        return self._handle_state(request.app["hass"], rest)
+
+    def _handle_state(self, hass: HomeAssistant, rest: str) -> web.Response:
+        """Set the state of a single entity from /api/ipx800v3/<entity_id>/<state>."""
+        entity_id, _, state = rest.partition("/")
+        if not entity_id or not state or "/" in state:
+            _LOGGER.warning("Malformed state update path: %s", rest)
+            return web.Response(status=HTTPStatus.BAD_REQUEST, text="Bad request")
+        if self._push_states(hass, {entity_id: state}):
+            _LOGGER.warning("Entity not found for state updating: %s", entity_id)
+            return web.Response(status=HTTPStatus.NOT_FOUND, text="Not found")
+        return web.Response(status=HTTPStatus.OK, text="OK")
 
-    def __init__(self, host: str, password: str) -> None:
-        """Init the IPX view."""
-        self.host = host
-        self.password = password
-        super().__init__()
+    def _handle_data(self, hass: HomeAssistant, data: str) -> web.Response:
+        """Set the state of multiple entities from /api/ipx800v3_data/<data>."""
+        states = {}
+        for entity_data in data.split("&"):
+            entity_id, _, raw = entity_data.partition("=")
+            states[entity_id] = "on" if raw in _TRUTHY else "off"
+
+        not_found = self._push_states(hass, states)
+        if not_found:
+            _LOGGER.warning(
+                "Entities not found for state updating: %s", ", ".join(not_found)
+            )
 
-    async def get(self, request, data):
-        """Respond to requests from the device."""
-        if not check_api_auth(request, self.host, self.password):
-            return web.Response(status=HTTPStatus.UNAUTHORIZED, text="Unauthorized")
-        hass = request.app["hass"]
-        entities_data = data.split("&")
-        for entity_data in entities_data:
-            entity_id = entity_data.split("=")[0]
-            state = "on" if entity_data.split("=")[1] in ["1", "on", "true"] else "off"
+        return web.Response(status=HTTPStatus.OK, text="OK")
 
-            old_state = hass.states.get(entity_id)
+    def _push_states(self, hass: HomeAssistant, states: dict[str, str]) -> list:
+        """Apply pushed states and return the entity ids not found.
+
+        States of the IPX800 entities are written to the coordinator data, so
+        the next poll is compared with what was pushed rather than with the
+        previous poll. Only the pushed entities that changed write their state,
+        and pending refreshes and the poll timer are left untouched. Other
+        entities are set directly in the state machine.
+        """
+        data = self.coordinator.data
+        updated_data = None
+        updated_entities = []
+        states_get = hass.states.get
+        states_set = hass.states.async_set
+        not_found = []
+        for entity_id, state in states.items():
+            entity = self.push_entities.get(entity_id)
+            if entity is not None:
+                value = 1 if state in _TRUTHY else 0
+                table = (updated_data or data)[entity.data_table]
+                ipx_id = entity.ipx_id
+                if ipx_id is None or not 0 <= ipx_id < len(table):
+                    _LOGGER.warning(
+                        "No IPX800 data for %s (%s id %s), push ignored",
+                        entity_id,
+                        entity.data_table,
+                        ipx_id,
+                    )
+                    continue
+                if table[ipx_id] == value:
+                    continue
+                if updated_data is None:
+                    updated_data = {
+                        prefix: list(values) for prefix, values in data.items()
+                    }
+                _LOGGER.debug("Update %s to state %s", entity_id, state)
+                updated_data[entity.data_table][ipx_id] = value
+                updated_entities.append(entity)
+                continue
+
+            old_state = states_get(entity_id)
+            if old_state is None:
+                not_found.append(entity_id)
+                continue
+            if old_state.state == state:
+                continue
             _LOGGER.debug("Update %s to state %s", entity_id, state)
-            if old_state:
-                hass.states.async_set(entity_id, state, old_state.attributes)
-            else:
-                _LOGGER.warning("Entity not found for state updating: %s", entity_id)
+            states_set(entity_id, state, old_state.attributes)
 
-        return web.Response(status=HTTPStatus.OK, text="OK")
+        if updated_data is not None:
+            self.coordinator.data = updated_data
+            for entity in updated_entities:
+                entity.async_write_ha_state()
+        return not_found
 
 
-class IpxRequestRefreshView(HomeAssistantView):
-    """Provide a page for the device to force refresh data from coordinator."""
+def get_output(outputs: dict[int, Output], ipx: IPX800V3, output_id: int) -> Output:
+    """Return the Output shared by the entities of an entry on the same relay."""
+    if output_id not in outputs:
+        outputs[output_id] = Output(ipx, output_id)
+    return outputs[output_id]
 
-    requires_auth = False
-    url = "/api/ipx800v3_refresh/{data}"
-    name = "api:ipx800v3_refresh"
 
-    def __init__(
-        self, host: str, password: str, coordinator: DataUpdateCoordinator
-    ) -> None:
-        """Init the IPX view."""
-        self.host = host
-        self.password = password
-        self.coordinator = coordinator
-        super().__init__()
+@lru_cache(maxsize=1024)
+def _slug(name: str) -> str:
+    """Return the cached slug of a device name."""
+    return slugify(name)
 
-    async def get(self, request, data):
-        """Respond to requests from the device."""
-        if not check_api_auth(request, self.host, self.password):
-            return web.Response(status=HTTPStatus.UNAUTHORIZED, text="Unauthorized")
-        await self.coordinator.async_request_refresh()
-        return web.Response(status=HTTPStatus.OK, text="OK")
+
+@lru_cache(maxsize=32)
+def _configuration_url(host: str, port: int) -> str:
+    """Return the cached configuration URL shared by a controller's entities."""
+    return f"http://{host}:{port}/api/xdevices.json"
 
 
 class IpxEntity(CoordinatorEntity):
     """Representation of a IPX800 generic device entity."""
 
+    data_table: str
+
     def __init__(
         self,
         device_config: dict,
@@ -447,16 +525,29 @@ class IpxEntity(CoordinatorEntity):
         )
         self._attr_icon = device_config.get(CONF_ICON)
         self._attr_unique_id = "_".join(
-            [DOMAIN, self.ipx.host, self._component, slugify(self._attr_name)]
+            [DOMAIN, self.ipx.host, self._component, _slug(self._attr_name)]
         )
 
-        configuration_url = f"http://{self.ipx.host}:{self.ipx.port}/api/xdevices.json"
-
         self._attr_device_info = {
-            "identifiers": {(DOMAIN, slugify(device_config[CONF_NAME]))},
+            "identifiers": {(DOMAIN, _slug(device_config[CONF_NAME]))},
             "name": device_config[CONF_NAME],
             "manufacturer": "GCE",
             "model": "IPX800 V3",
             "via_device": (DOMAIN, self.ipx.host),
-            "configuration_url": configuration_url,
+            "configuration_url": _configuration_url(self.ipx.host, self.ipx.port),
         }
+
+    @property
+    def ipx_id(self) -> int | None:
+        """Return the id of the entity on the IPX800."""
+        return self._id
+
+    async def async_added_to_hass(self) -> None:
+        """Register the entity to receive the states pushed by the IPX800."""
+        await super().async_added_to_hass()
+        push_entities = self.hass.data[DOMAIN][self.platform.config_entry.entry_id][
+            PUSH_ENTITIES
+        ]
+        entity_id = self.entity_id
+        push_entities[entity_id] = self
+        self.async_on_remove(lambda: push_entities.pop(entity_id, None))
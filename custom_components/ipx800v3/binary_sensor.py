@@ -9,9 +9,9 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from . import IpxEntity
 from .const import (
     CONF_DEVICES,
-    CONF_TYPE,
     CONTROLLER,
     COORDINATOR,
+    DATA_INPUTS,
     DOMAIN,
     GLOBAL_PARALLEL_UPDATES,
     TYPE_DIGITALIN,
@@ -31,18 +31,19 @@ async def async_setup_entry(
     coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
     devices = hass.data[DOMAIN][entry.entry_id][CONF_DEVICES]["binary_sensor"]
 
-    entities: list[BinarySensorEntity] = []
-
-    for device in devices:
-        if device.get(CONF_TYPE) == TYPE_DIGITALIN:
-            entities.append(DigitalInBinarySensor(device, controller, coordinator))
+    entities: list[BinarySensorEntity] = [
+        DigitalInBinarySensor(device, controller, coordinator)
+        for device in devices[TYPE_DIGITALIN]
+    ]
 
     async_add_entities(entities, True)
 
 class DigitalInBinarySensor(IpxEntity, BinarySensorEntity):
     """Representation of a IPX Digital In."""
 
+    data_table = DATA_INPUTS
+
     @property
     def is_on(self) -> bool:
         """Return the state."""
-        return self.coordinator.data[f"IN{self._id}"] == 1
+        return self.coordinator.data[self.data_table][self._id] == 1
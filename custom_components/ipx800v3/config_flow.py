@@ -1,6 +1,4 @@
 """Config flow to configure the ipx800v3 integration."""
-from datetime import timedelta
-
 import voluptuous as vol
 
 from homeassistant import config_entries
@@ -8,7 +6,7 @@ from homeassistant.const import CONF_NAME, CONF_SCAN_INTERVAL
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
-from .const import COORDINATOR, DEFAULT_SCAN_INTERVAL, DOMAIN
+from .const import DEFAULT_SCAN_INTERVAL, DOMAIN
 
 
 @config_entries.HANDLERS.register(DOMAIN)
@@ -61,12 +59,6 @@ class Ipx800OptionsFlowHandler(config_entries.OptionsFlow):
     async def async_step_init(self, user_input=None) -> FlowResult:
         """Manage the options."""
         if user_input is not None:
-            coordinator = self.hass.data[DOMAIN][self.config_entry.entry_id][
-                COORDINATOR
-            ]
-            update_interval_sec = user_input[CONF_SCAN_INTERVAL]
-            update_interval = timedelta(seconds=update_interval_sec)
-            coordinator.update_interval = update_interval
             return self.async_create_entry(title="", data=user_input)
 
         scan_interval = self.config_entry.options.get(
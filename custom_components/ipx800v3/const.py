@@ -3,13 +3,17 @@ DOMAIN = "ipx800v3"
 
 CONTROLLER = "controller"
 COORDINATOR = "coordinator"
+ENTRY_DATA = "entry_data"
+OUTPUTS = "outputs"
+PUSH_ENTITIES = "push_entities"
 UNDO_UPDATE_LISTENER = "undo_update_listener"
 GLOBAL_PARALLEL_UPDATES = 1
 PUSH_USERNAME = "ipx800"
 
 DEFAULT_SCAN_INTERVAL = 10
+MIN_SCAN_INTERVAL = 10
 DEFAULT_TRANSITION = 0.5
-REQUEST_REFRESH_DELAY = 0.5
+REQUEST_REFRESH_DELAY = 2.0
 
 CONF_DEVICES = "devices"
 
@@ -20,20 +24,28 @@ CONF_PUSH_PASSWORD = "push_password"
 CONF_TRANSITION = "transition"
 CONF_TYPE = "type"
 
+DATA_INPUTS = "IN"
+DATA_OUTPUTS = "OUT"
+DATA_PREFIXES = (DATA_OUTPUTS, DATA_INPUTS)
+
 TYPE_RELAY = "relay"
 TYPE_DIGITALIN = "digitalin"
 
 
-CONF_COMPONENT_ALLOWED = [
-    "light",
-    "switch",
-    "binary_sensor"
-]
-
-CONF_TYPE_ALLOWED = [
-    TYPE_RELAY,
-    TYPE_DIGITALIN,
-]
+CONF_COMPONENT_ALLOWED = frozenset(
+    {
+        "light",
+        "switch",
+        "binary_sensor",
+    }
+)
+
+CONF_TYPE_ALLOWED = frozenset(
+    {
+        TYPE_RELAY,
+        TYPE_DIGITALIN,
+    }
+)
 
 PLATFORMS = [
     "binary_sensor",
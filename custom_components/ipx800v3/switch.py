@@ -10,14 +10,15 @@ from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
 
-from . import IpxEntity
+from . import IpxEntity, get_output
 from .const import (
     CONF_DEVICES,
-    CONF_TYPE,
     CONTROLLER,
     COORDINATOR,
+    DATA_OUTPUTS,
     DOMAIN,
     GLOBAL_PARALLEL_UPDATES,
+    OUTPUTS,
     TYPE_RELAY
 )
 
@@ -33,13 +34,13 @@ async def async_setup_entry(
     """Set up the IPX800 switches."""
     controller = hass.data[DOMAIN][entry.entry_id][CONTROLLER]
     coordinator = hass.data[DOMAIN][entry.entry_id][COORDINATOR]
+    outputs = hass.data[DOMAIN][entry.entry_id][OUTPUTS]
     devices = hass.data[DOMAIN][entry.entry_id][CONF_DEVICES]["switch"]
 
-    entities: list[SwitchEntity] = []
-
-    for device in devices:
-        if device.get(CONF_TYPE) == TYPE_RELAY:
-            entities.append(RelaySwitch(device, controller, coordinator))
+    entities: list[SwitchEntity] = [
+        RelaySwitch(device, controller, coordinator, outputs)
+        for device in devices[TYPE_RELAY]
+    ]
 
     async_add_entities(entities, True)
 
@@ -47,20 +48,23 @@ async def async_setup_entry(
 class RelaySwitch(IpxEntity, SwitchEntity):
     """Representation of a IPX Switch through relay."""
 
+    data_table = DATA_OUTPUTS
+
     def __init__(
         self,
         device_config: dict,
         ipx: IPX800V3,
         coordinator: DataUpdateCoordinator,
+        outputs: dict[int, Output],
     ) -> None:
         """Initialize the RelaySwitch."""
         super().__init__(device_config, ipx, coordinator)
-        self.control = Output(ipx, self._id)
+        self.control = get_output(outputs, ipx, self._id)
 
     @property
     def is_on(self) -> bool:
         """Return the state."""
-        return self.coordinator.data[f"OUT{self._id}"] == 1
+        return self.coordinator.data[self.data_table][self._id] == 1
 
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn on the switch."""